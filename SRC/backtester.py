@@ -3,15 +3,24 @@ import pandas as pd
 import numpy as np
 import logging
 from datetime import datetime
+from src.session_index import SessionIndex
+from src.bootstrap import bootstrap_metrics
 
 logger = logging.getLogger(__name__)
 
 class Backtester:
-    def __init__(self, data_fetcher, magnet_detector, options_engine, risk_manager):
+    def __init__(self, data_fetcher, magnet_detector, options_engine, risk_manager,
+                 feature_store=None, session_start="09:30", session_end="16:00",
+                 session_mode="RTH", use_entry_filters=False):
         self.data_fetcher = data_fetcher
         self.magnet_detector = magnet_detector
         self.options_engine = options_engine
         self.risk_manager = risk_manager
+        self.feature_store = feature_store
+        self.use_entry_filters = use_entry_filters
+        self.session_start = session_start
+        self.session_end = session_end
+        self.session_mode = session_mode
         self.trades = []
     
     def run_backtest(self, days=30):
@@ -24,20 +33,54 @@ class Backtester:
             if data is None:
                 return None
             
+            data = data.sort_values('Datetime').reset_index(drop=True)
+            
+            # MMI/VLS filtr předpočítaný pro všechny bary (volitelný)
+            entry_ok = None
+            if self.feature_store is not None and self.use_entry_filters:
+                features = self.feature_store.update(
+                    self.data_fetcher.historical_source(days), data
+                )
+                if features is not None:
+                    entry_ok = features['passes_filters'].reindex(
+                        data['Datetime']
+                    ).fillna(False).to_numpy()
+            
+            self.magnet_detector.magnet_memory.clear()
+            
             results = []
             daily_pnl = 0
             
-            # Pro každý den
-            for date, day_data in data.groupby(data['Datetime'].dt.date):
+            # Offsety session (RTH/ETH) spočítané jednou pro celý dataset
+            sessions = SessionIndex(
+                data['Datetime'], self.session_start, self.session_end,
+                mode=self.session_mode
+            )
+            
+            # Numpy sloupce; okna v session jsou jen jejich řezy
+            close = data['Close'].to_numpy(dtype=float)
+            volume = data['Volume'].to_numpy()
+            timestamps = pd.DatetimeIndex(data['Datetime']).asi8 / 1e9
+            
+            # Pro každou session
+            for date, start, (s_close, s_volume, s_time) in sessions.views(
+                close, volume, timestamps
+            ):
                 logger.info(f"\n=== {date} ===")
                 self.risk_manager.reset_daily_loss()
                 
+                # Dotyk magnetu nepřetrvává přes přestávku mezi session
+                self.magnet_detector.magnet_memory.end_touch()
+                
                 # Pro každý 5m interval
-                for i in range(20, len(day_data)):  # Začni po 20 ti minutách
-                    window = day_data.iloc[i-20:i]
+                for i in range(20, len(s_close)):  # Začni po 20 ti minutách
+                    # Detekuj aktivní magnet (každý bar, kvůli historii dotyků)
+                    magnet_data = self.magnet_detector.detect_active_magnet_arrays(
+                        s_close[i-20:i], s_volume[i-20:i], s_time[i-1]
+                    )
                     
-                    # Detekuj aktivní magnet
-                    magnet_data = self.magnet_detector.detect_active_magnet(window)
+                    if entry_ok is not None and not entry_ok[start + i - 1]:
+                        continue
                     
                     if magnet_data and magnet_data['is_active']:
                         # Získej strategii
@@ -48,7 +91,7 @@ class Backtester:
                         if rec['action'].startswith("SELL"):
                             # Simuluj obchod
                             trade_result = self.simulate_trade(
-                                rec, window.iloc[-1], magnet_data
+                                rec, data.iloc[start + i - 1], magnet_data
                             )
                             results.append(trade_result)
                             
@@ -91,6 +134,7 @@ class Backtester:
             
             trade = {
                 "timestamp": datetime.now(),
+                "bar_time": current_data.get('Datetime'),
                 "magnet": magnet,
                 "entry_price": entry_price,
                 "strategy": strategy['strategy'],
@@ -133,6 +177,12 @@ class Backtester:
         # Edge
         edge = (win_rate * avg_win - (1-win_rate) * abs(avg_loss)) / abs(avg_loss)
         
+        # Bootstrap intervaly (block bootstrap po dnech)
+        days = None
+        if df['bar_time'].notna().all():
+            days = pd.to_datetime(df['bar_time']).dt.date.values
+        confidence_intervals = bootstrap_metrics(df['pnl'].values, labels=days)
+        
         return {
             "total_trades": total_trades,
             "win_rate": win_rate,
@@ -142,5 +192,6 @@ class Backtester:
             "total_pnl": total_pnl,
             "profit_factor": profit_factor,
             "edge": edge,
+            "confidence_intervals": confidence_intervals,
             "final_balance": self.risk_manager.current_balance
         }
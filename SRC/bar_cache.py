@@ -0,0 +1,74 @@
+# src/bar_cache.py
+import threading
+import time
+from collections import OrderedDict
+import logging
+
+logger = logging.getLogger(__name__)
+
+class _InFlight:
+    """Probíhající fetch, na který čekají další vlákna"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+class SharedBarCache:
+    """
+    Thread-safe cache s TTL a LRU evikcí sdílená celým procesem.
+    Souběžné požadavky na stejný klíč čekají na jediný fetch (single-flight).
+    """
+    def __init__(self, ttl=30, max_entries=32):
+        self.ttl = ttl  # sekundy
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # klíč -> (čas uložení, hodnota)
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.upstream_calls = 0
+
+    def get_or_fetch(self, key, fetch_fn):
+        """Vrátí hodnotu z cache, jinak ji stáhne (jednou pro všechny čekající)"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self.entries.move_to_end(key)
+                return entry[1]
+
+            flight = self.in_flight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _InFlight()
+                self.in_flight[key] = flight
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = fetch_fn()
+            with self.lock:
+                self.upstream_calls += 1
+                # Prázdné výsledky necachujeme
+                if flight.value is not None and not getattr(flight.value, "empty", False):
+                    self.entries[key] = (time.monotonic(), flight.value)
+                    self.entries.move_to_end(key)
+                    while len(self.entries) > self.max_entries:
+                        self.entries.popitem(last=False)
+            return flight.value
+
+        except Exception as e:
+            flight.error = e
+            logger.error(f"Error fetching {key}: {e}")
+            raise
+
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+            flight.done.set()
+
+    def clear(self):
+        """Vymaže cache"""
+        with self.lock:
+            self.entries.clear()
@@ -0,0 +1,126 @@
+# src/bootstrap.py
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+METRICS = ["win_rate", "avg_win", "avg_loss", "avg_pnl", "total_pnl",
+           "profit_factor", "edge"]
+
+# Nad tímto počtem prvků (resamply × bloky) se výpočet dělí mezi procesy
+PARALLEL_THRESHOLD = 50_000_000
+CHUNK_ELEMENTS = 1_000_000
+
+def _block_stats(pnl, labels=None):
+    """
+    Agregace po blocích: [obchody, výhry, prohry, suma výher, suma proher].
+    Bez labels je každý obchod vlastní blok (klasický bootstrap).
+    """
+    wins = pnl > 0
+    losses = pnl < 0
+    per_trade = np.column_stack([
+        np.ones_like(pnl), wins, losses,
+        np.where(wins, pnl, 0.0), np.where(losses, pnl, 0.0)
+    ]).astype(float)
+
+    if labels is None:
+        return per_trade
+
+    _, block_ids = np.unique(labels, return_inverse=True)
+    stats = np.zeros((block_ids.max() + 1, per_trade.shape[1]))
+    np.add.at(stats, block_ids, per_trade)
+    return stats
+
+def _metrics_from_sums(sums):
+    """Metriky z agregovaných součtů (sloupce jako v _block_stats)"""
+    trades, n_win, n_loss, sum_win, sum_loss = sums.T
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        win_rate = n_win / trades
+        avg_win = sum_win / n_win
+        avg_loss = sum_loss / n_loss
+        total_pnl = sum_win + sum_loss
+        avg_pnl = total_pnl / trades
+        profit_factor = np.where(sum_loss < 0, sum_win / -sum_loss, 0.0)
+        edge = (win_rate * avg_win - (1 - win_rate) * np.abs(avg_loss)) / np.abs(avg_loss)
+
+    return {
+        "win_rate": win_rate,
+        "avg_win": avg_win,
+        "avg_loss": avg_loss,
+        "avg_pnl": avg_pnl,
+        "total_pnl": total_pnl,
+        "profit_factor": profit_factor,
+        "edge": edge
+    }
+
+def _resample_sums(stats, n_resamples, seed):
+    """Resampluje bloky po dávkách jako 2-D operaci, vrací součty"""
+    rng = np.random.default_rng(seed)
+    n_blocks = len(stats)
+    chunk = max(1, CHUNK_ELEMENTS // n_blocks)
+
+    sums = np.empty((n_resamples, stats.shape[1]))
+    for start in range(0, n_resamples, chunk):
+        stop = min(start + chunk, n_resamples)
+        idx = rng.integers(0, n_blocks, size=(stop - start, n_blocks))
+        sums[start:stop] = stats[idx].sum(axis=1)
+
+    return sums
+
+def bootstrap_metrics(pnl, labels=None, n_resamples=10_000, confidence=0.95,
+                      seed=None, n_jobs=None):
+    """
+    Bootstrap intervaly spolehlivosti pro metriky backtestu.
+    labels = den obchodu pro block bootstrap (resampluje celé dny)
+    Vrací {metrika: {"lower", "upper", "undefined"}}, kde undefined je podíl
+    resamplů, ve kterých metrika není definovaná (např. edge bez ztrát).
+    """
+    try:
+        pnl = np.asarray(pnl, dtype=float)
+        if len(pnl) == 0:
+            return None
+
+        stats = _block_stats(pnl, labels)
+        n_blocks = len(stats)
+
+        if n_jobs is None:
+            n_jobs = os.cpu_count() or 1
+            if n_resamples * n_blocks < PARALLEL_THRESHOLD:
+                n_jobs = 1
+
+        seeds = np.random.SeedSequence(seed).spawn(n_jobs)
+        counts = [len(part) for part in np.array_split(np.arange(n_resamples), n_jobs)]
+
+        if n_jobs == 1:
+            sums = _resample_sums(stats, n_resamples, seeds[0])
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                parts = pool.map(_resample_sums, [stats] * n_jobs, counts, seeds)
+                sums = np.concatenate(list(parts))
+
+        samples = _metrics_from_sums(sums)
+        alpha = (1 - confidence) / 2
+
+        # Resamply bez ztrát (nebo výher) nemají avg_loss/edge definované -
+        # interval je podmíněný definovanými resamply a jejich podíl se hlásí
+        intervals = {}
+        for name in METRICS:
+            values = samples[name]
+            defined = np.isfinite(values)
+            lower = upper = np.nan
+            if defined.any():
+                lower, upper = np.quantile(values[defined], [alpha, 1 - alpha])
+            intervals[name] = {
+                "lower": float(lower),
+                "upper": float(upper),
+                "undefined": float(1 - defined.mean())
+            }
+
+        return intervals
+
+    except Exception as e:
+        logger.error(f"Error in bootstrap: {e}")
+        return None
@@ -5,21 +5,82 @@ import numpy as np
 from datetime import datetime, timedelta
 import requests
 import logging
+from src.resampler import BarResampler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class ESDataFetcher:
-    def __init__(self):
+    # yfinance poskytuje 1m data jen za posledních 7 dní
+    MINUTE_HISTORY_DAYS = 7
+    
+    def __init__(self, cache=None):
         self.es_symbol = "ES=F"
         self.vix_symbol = "^VIX"
+        self.cache = cache  # sdílená SharedBarCache (volitelná)
+        self.resampler = BarResampler(max_bars=self.MINUTE_HISTORY_DAYS * 24 * 60)
+        self.minute_days = 0  # kolik dní 1m historie je načteno
+    
+    def _history(self, symbol, period, interval):
+        """Stáhne bary z yfinance, přes sdílenou cache pokud je nastavena"""
+        def fetch():
+            return yf.Ticker(symbol).history(period=period, interval=interval)
+        
+        if self.cache is None:
+            return fetch()
+        return self.cache.get_or_fetch((symbol, period, interval), fetch)
+    
+    def refresh_minute_bars(self, days=1):
+        """Stáhne 1m bary ES (po prvním načtení jen úsek od posledního baru)"""
+        try:
+            stored = self.resampler.get("1m")
+            if stored is None or days > self.minute_days:
+                period = days
+            else:
+                last_bar = stored.index[-1]
+                period = (pd.Timestamp.now(tz=last_bar.tz) - last_bar).days + 1
+            period = min(period, self.MINUTE_HISTORY_DAYS)
+            
+            es_data = self._history(self.es_symbol, f"{period}d", "1m")
+            
+            if es_data.empty:
+                logger.error("Nemohu získat 1m data")
+                return False
+            
+            self.resampler.append(es_data)
+            self.minute_days = max(self.minute_days, days)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error fetching minute data: {e}")
+            return False
+    
+    def get_bars(self, timeframe="5m", days=1):
+        """Vrátí OHLCV daného timeframu odvozené z 1m barů"""
+        try:
+            days = min(days, self.MINUTE_HISTORY_DAYS)
+            if not self.refresh_minute_bars(days):
+                return None
+            
+            bars = self.resampler.get(timeframe)
+            bars = bars[bars.index >= bars.index[-1] - timedelta(days=days)]
+            
+            # Reset index pro práci s datetime
+            bars = bars.rename_axis('Datetime').reset_index()
+            return bars
+            
+        except Exception as e:
+            logger.error(f"Error getting {timeframe} bars: {e}")
+            return None
     
     def get_current_data(self):
         """Získá aktuální cenu a základní data pro ES futures"""
         try:
-            # ES futures
-            es = yf.Ticker(self.es_symbol)
-            es_data = es.history(period="1d", interval="1m")
+            # ES futures (sdílené 1m bary)
+            if not self.refresh_minute_bars(days=1):
+                logger.error("Nemohu získat ES data")
+                return None
+            es_data = self.resampler.get("1m")
             
             if es_data.empty:
                 logger.error("Nemohu získat ES data")
@@ -29,8 +90,7 @@ class ESDataFetcher:
             current_volume = es_data['Volume'].iloc[-1]
             
             # VIX pro market sentiment
-            vix = yf.Ticker(self.vix_symbol)
-            vix_data = vix.history(period="1d", interval="1m")
+            vix_data = self._history(self.vix_symbol, "1d", "1m")
             vix_level = vix_data['Close'].iloc[-1] if not vix_data.empty else 15
             
             return {
@@ -44,11 +104,20 @@ class ESDataFetcher:
             logger.error(f"Error fetching data: {e}")
             return None
     
+    def historical_source(self, days=30):
+        """Klíč zdroje dat, která vrací get_historical_data(days)"""
+        if days <= self.MINUTE_HISTORY_DAYS:
+            return "ES_5m_from_1m"
+        return "ES_5m"
+    
     def get_historical_data(self, days=30):
         """Získá historická data pro backtesting"""
         try:
-            es = yf.Ticker(self.es_symbol)
-            hist = es.history(period=f"{days}d", interval="5m")
+            # Krátká historie se odvozuje z 1m barů (sdílí fetch s live)
+            if days <= self.MINUTE_HISTORY_DAYS:
+                return self.get_bars("5m", days)
+            
+            hist = self._history(self.es_symbol, f"{days}d", "5m")
             
             if hist.empty:
                 logger.error("Nemohu získat historická data")
@@ -0,0 +1,175 @@
+# src/feature_store.py
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import logging
+from src.session_index import ETH_ROLL_HOURS
+
+logger = logging.getLogger(__name__)
+
+FEATURE_COLUMNS = ["atr_5d", "avg_volume_20d", "magnet", "touched_magnet",
+                   "previous_magnet", "mmi", "vls"]
+
+class FeatureStore:
+    def __init__(self, cache_dir, multipliers=[50, 100], tolerance=3, atr_days=5,
+                 volume_days=20, mmi_threshold=1.5, vls_threshold=2.0):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.multipliers = multipliers
+        self.tolerance = tolerance
+        self.atr_days = atr_days
+        self.volume_days = volume_days
+        self.mmi_threshold = mmi_threshold
+        self.vls_threshold = vls_threshold
+
+    def _paths(self, key):
+        """Cesty k cache barů a featur (featury leží vedle barů)"""
+        return (self.cache_dir / f"{key}_bars.pkl",
+                self.cache_dir / f"{key}_features.pkl")
+
+    def nearest_magnets(self, prices):
+        """Vektorizovaná obdoba MagnetDetector.find_nearest_magnet"""
+        prices = np.asarray(prices, dtype=float)
+        rounded = np.round(prices)
+
+        candidates = []
+        for mult in self.multipliers:
+            base = (rounded // mult) * mult
+            candidates.extend([base, base + mult])
+
+        candidates = np.stack(candidates)
+        nearest_idx = np.argmin(np.abs(candidates - prices), axis=0)
+        return candidates[nearest_idx, np.arange(len(prices))]
+
+    def compute_features(self, bars, seed=None):
+        """
+        Spočítá ATR, průměrný objem, MMI a VLS pro každý bar najednou.
+        seed = poslední řádek featur z cache (pro navázání previous_magnet)
+        """
+        bars = bars.sort_values("Datetime")
+        ts = bars.set_index("Datetime")
+
+        # Denní ATR: True Range denních barů (session od 18:00),
+        # průměr přes N předchozích uzavřených dní
+        session_day = (ts.index + pd.Timedelta(hours=ETH_ROLL_HOURS)).normalize()
+        daily = ts.groupby(session_day).agg({"High": "max", "Low": "min", "Close": "last"})
+        prev_close = daily["Close"].shift(1)
+        true_range = pd.concat([
+            daily["High"] - daily["Low"],
+            (daily["High"] - prev_close).abs(),
+            (daily["Low"] - prev_close).abs()
+        ], axis=1).max(axis=1)
+        daily_atr = true_range.rolling(self.atr_days, min_periods=self.atr_days).mean().shift(1)
+        atr = pd.Series(daily_atr.reindex(session_day).to_numpy(), index=ts.index)
+        avg_volume = ts["Volume"].rolling(f"{self.volume_days}D").mean()
+
+        # Nejbližší magnet; dotčený magnet a předchozí odlišný dotčený
+        # magnet stejně jako MagnetHistory (dotyk = cena v toleranci)
+        magnet = pd.Series(self.nearest_magnets(ts["Close"].values), index=ts.index)
+        touched = magnet.where((ts["Close"] - magnet).abs() <= self.tolerance).ffill()
+        if seed is not None:
+            touched = touched.fillna(seed["touched_magnet"])
+        shifted = touched.shift(1)
+        if seed is not None:
+            shifted.iloc[0] = seed["touched_magnet"]
+        previous = shifted.where(touched != shifted)
+        if seed is not None and pd.isna(previous.iloc[0]):
+            previous.iloc[0] = seed["previous_magnet"]
+        previous = previous.ffill()
+
+        # MMI = (Current - Previous) / ATR, 0 pokud chybí data
+        mmi = ((magnet - previous) / atr.replace(0, np.nan)).fillna(0)
+
+        # VLS = (Volume / Avg_Volume) × Direction
+        direction = np.where(ts["Close"] >= ts["Open"], 1, -1)
+        vls = ((ts["Volume"] / avg_volume.replace(0, np.nan)) * direction).fillna(0)
+
+        features = pd.DataFrame({
+            "atr_5d": atr,
+            "avg_volume_20d": avg_volume,
+            "magnet": magnet,
+            "touched_magnet": touched,
+            "previous_magnet": previous,
+            "mmi": mmi,
+            "vls": vls
+        }, index=ts.index)
+
+        return features
+
+    def entry_mask(self, features):
+        """Vstupní filtr MMI/VLS jako boolean maska"""
+        return ((features["mmi"].abs() >= self.mmi_threshold) &
+                (features["vls"].abs() >= self.vls_threshold))
+
+    def _with_filters(self, features):
+        """Filtr se počítá při čtení, aby platily aktuální prahy z configu"""
+        return features.assign(passes_filters=self.entry_mask(features))
+
+    def _rebuild(self, key, bars):
+        """Přepočítá featury pro všechny bary a přepíše cache"""
+        bars_path, features_path = self._paths(key)
+        features = self.compute_features(bars)
+        bars.to_pickle(bars_path)
+        features.to_pickle(features_path)
+        return self._with_filters(features)
+
+    def update(self, key, bars):
+        """
+        Přidá nové bary do cache a dopočítá featury pouze pro ně.
+        Vrací featury pro všechny bary v cache.
+        """
+        try:
+            bars_path, features_path = self._paths(key)
+            bars = bars.sort_values("Datetime").drop_duplicates("Datetime", keep="last")
+
+            if not bars_path.exists() or not features_path.exists():
+                return self._rebuild(key, bars)
+
+            cached_bars = pd.read_pickle(bars_path)
+            cached_features = pd.read_pickle(features_path)
+            last_time = cached_bars["Datetime"].iloc[-1]
+
+            # Cache ze starší verze featur
+            if not set(FEATURE_COLUMNS) <= set(cached_features.columns):
+                union = pd.concat([cached_bars, bars]).sort_values("Datetime")
+                union = union.drop_duplicates("Datetime", keep="last").reset_index(drop=True)
+                return self._rebuild(key, union)
+
+            # Bary starší než konec cache, které v ní chybí (např. delší
+            # backtest po kratším) - přepočítej sjednocení starých a nových
+            older = bars[bars["Datetime"] <= last_time]
+            if (~older["Datetime"].isin(cached_bars["Datetime"])).any():
+                logger.info(f"Feature store {key}: rozšíření historie, přepočítávám")
+                union = pd.concat([cached_bars, bars]).sort_values("Datetime")
+                union = union.drop_duplicates("Datetime", keep="last").reset_index(drop=True)
+                return self._rebuild(key, union)
+
+            # Poslední bar v cache může být neuzavřený - bere se znovu a přepíše
+            new_bars = bars[bars["Datetime"] >= last_time]
+            if new_bars.empty:
+                return self._with_filters(cached_features)
+
+            # Historie potřebná pro rolling okna
+            lookback = pd.Timedelta(days=max(2 * self.atr_days, self.volume_days) + 1)
+            first_new = new_bars["Datetime"].iloc[0]
+            cached_bars = cached_bars[cached_bars["Datetime"] < first_new]
+            cached_features = cached_features[cached_features.index < first_new]
+            history = cached_bars[cached_bars["Datetime"] >= (first_new - lookback).normalize()]
+
+            tail = pd.concat([history, new_bars], ignore_index=True)
+            before_tail = cached_features[cached_features.index < tail["Datetime"].iloc[0]]
+            seed = before_tail.iloc[-1] if not before_tail.empty else None
+            tail_features = self.compute_features(tail, seed=seed)
+            tail_features = tail_features[tail_features.index >= first_new]
+
+            all_bars = pd.concat([cached_bars, new_bars], ignore_index=True)
+            features = pd.concat([cached_features, tail_features])
+            all_bars.to_pickle(bars_path)
+            features.to_pickle(features_path)
+
+            logger.info(f"Feature store {key}: +{len(new_bars)} barů")
+            return self._with_filters(features)
+
+        except Exception as e:
+            logger.error(f"Error updating feature store: {e}")
+            return None
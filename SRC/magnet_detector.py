@@ -1,16 +1,18 @@
 # src/magnet_detector.py
 import numpy as np
 import pandas as pd
-from collections import defaultdict
 import logging
+from src.magnet_history import MagnetHistory
 
 logger = logging.getLogger(__name__)
 
 class MagnetDetector:
-    def __init__(self, multipliers=[50, 100], tolerance=3):
+    def __init__(self, multipliers=[50, 100], tolerance=3, history_size=4096,
+                 history_max_age=5 * 24 * 3600):
         self.multipliers = multipliers
         self.tolerance = tolerance
-        self.magnet_memory = defaultdict(list)  # Ukládá historii magnetů
+        # Ukládá historii magnetů (omezený ring buffer)
+        self.magnet_memory = MagnetHistory(history_size, history_max_age)
     
     def find_nearest_magnet(self, price):
         """Najde nejbližší psychologickou úroveň"""
@@ -41,31 +43,53 @@ class MagnetDetector:
         3. Čas strávený na úrovni
         """
         try:
-            current_price = data['Close'].iloc[-1]
+            timestamp = None
+            if 'Datetime' in data.columns:
+                timestamp = pd.Timestamp(data['Datetime'].iloc[-1]).timestamp()
+            
+            return self.detect_active_magnet_arrays(
+                data['Close'].to_numpy(), data['Volume'].to_numpy(), timestamp, window
+            )
+            
+        except Exception as e:
+            logger.error(f"Error detecting active magnet: {e}")
+            return None
+    
+    def detect_active_magnet_arrays(self, close, volume, timestamp=None, window=15):
+        """
+        Totéž co detect_active_magnet nad numpy poli Close/Volume
+        (okna jsou řezy bez kopírování, timestamp v sekundách epochy)
+        """
+        try:
+            current_price = close[-1]
             magnet, distance = self.find_nearest_magnet(current_price)
             
             if distance > self.tolerance:
+                self.magnet_memory.end_touch()
                 logger.info(f"Cena {current_price} je příliš daleko od magnetu {magnet}")
                 return None
             
             # Spočítej čas strávený na této úrovni
-            recent_data = data.tail(window)
-            in_range = 0
-            
-            for _, row in recent_data.iterrows():
-                if abs(row['Close'] - magnet) <= self.tolerance:
-                    in_range += 1
+            in_level = np.abs(close[-window:] - magnet) <= self.tolerance
+            in_range = int(in_level.sum())
             
             time_at_level = in_range / window  # Procento času
             
             # Spočítej objem na této úrovni
-            volume_profile = self.get_volume_at_level(recent_data, magnet)
+            volume_profile = volume[-window:][in_level].sum()
+            
+            # Zapiš bar do historie dotyků magnetů
+            self.magnet_memory.record_touch(
+                magnet, timestamp, duration=1, volume=volume[-1]
+            )
             
             return {
                 "level": magnet,
                 "distance": distance,
                 "time_at_level": time_at_level,
                 "volume_at_level": volume_profile,
+                "previous_magnet": self.magnet_memory.get_previous_magnet(),
+                "touch_count": self.magnet_memory.get_touch_count(magnet),
                 "is_active": time_at_level > 0.6  # Aktivní pokud >60% času
             }
             
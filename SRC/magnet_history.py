@@ -0,0 +1,130 @@
+# src/magnet_history.py
+import numpy as np
+import time
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class MagnetHistory:
+    """
+    Omezená historie dotyků magnetů (ring buffer s indexem podle úrovně).
+    Paměť zůstává konstantní i při týdnech běhu live session.
+    """
+    def __init__(self, capacity=4096, max_age=5 * 24 * 3600):
+        self.capacity = capacity
+        self.max_age = max_age  # sekundy
+
+        self.levels = np.zeros(capacity, dtype=float)
+        self.times = np.zeros(capacity, dtype=float)
+        self.durations = np.zeros(capacity, dtype=float)
+        self.volumes = np.zeros(capacity, dtype=float)
+
+        # Live detektor je sdílený mezi session dashboardu
+        self.lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        """Vymaže historii"""
+        with self.lock:
+            self._reset()
+
+    def _reset(self):
+        self.head = 0    # další slot pro zápis
+        self.size = 0
+        self.touch_counts = {}
+        self.last_level = None
+        self.last_time = None
+        self.previous_level = None
+        self.previous_time = None
+        self.open_slot = None     # slot právě probíhajícího dotyku
+        self.last_update = None
+
+    def _tail(self):
+        return (self.head - self.size) % self.capacity
+
+    def _evict_oldest(self):
+        tail = self._tail()
+        if tail == self.open_slot:
+            self.open_slot = None
+        level = self.levels[tail]
+        self.touch_counts[level] -= 1
+        if self.touch_counts[level] == 0:
+            del self.touch_counts[level]
+        self.size -= 1
+
+    def _evict_expired(self, now):
+        # Otevřený dotyk se nevyhazuje, dokud trvá
+        while self.size and self._tail() != self.open_slot \
+                and self.times[self._tail()] < now - self.max_age:
+            self._evict_oldest()
+
+    def record_touch(self, level, timestamp=None, duration=1, volume=0):
+        """
+        Zaznamená bar na úrovni magnetu (timestamp v sekundách epochy).
+        Pokračující pobyt na stejné úrovni prodlužuje otevřený dotyk,
+        nový dotyk začíná při změně úrovně nebo po end_touch().
+        """
+        with self.lock:
+            now = time.time() if timestamp is None else float(timestamp)
+            level = float(level)
+
+            # Stejný bar zaznamenaný opakovaně (např. opakované kliknutí)
+            if self.open_slot is not None and self.last_update is not None \
+                    and now <= self.last_update and level == self.last_level:
+                return
+
+            if self.open_slot is not None and level == self.last_level:
+                self.durations[self.open_slot] += duration
+                self.volumes[self.open_slot] += volume
+                self.last_update = now
+                self.last_time = now
+                self._evict_expired(now)
+                return
+
+            if self.size == self.capacity:
+                self._evict_oldest()
+
+            self.levels[self.head] = level
+            self.times[self.head] = now
+            self.durations[self.head] = duration
+            self.volumes[self.head] = volume
+            self.open_slot = self.head
+            self.head = (self.head + 1) % self.capacity
+            self.size += 1
+            self.touch_counts[level] = self.touch_counts.get(level, 0) + 1
+
+            # Poslední odlišný magnet
+            if self.last_level is not None and level != self.last_level:
+                self.previous_level = self.last_level
+                self.previous_time = self.last_time
+            self.last_level = level
+            self.last_time = now
+            self.last_update = now
+
+            self._evict_expired(now)
+
+    def end_touch(self):
+        """Cena opustila toleranci magnetu - uzavře probíhající dotyk"""
+        with self.lock:
+            self.open_slot = None
+
+    def get_previous_magnet(self, now=None):
+        """Poslední magnet odlišný od aktuálního, None pokud je příliš starý"""
+        with self.lock:
+            if self.previous_level is None:
+                return None
+
+            now = self.last_time if now is None else float(now)
+            if self.previous_time < now - self.max_age:
+                return None
+
+            return self.previous_level
+
+    def get_touch_count(self, level):
+        """Počet dotyků úrovně v aktuální historii"""
+        with self.lock:
+            return self.touch_counts.get(float(level), 0)
+
+    def __len__(self):
+        return self.size
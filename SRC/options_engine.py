@@ -5,6 +5,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# 0DTE (expirace 0 dní) se oceňuje se zbývající hodinou do expirace
+MIN_DAYS_TO_EXPIRY = 1 / 24
+
 class OptionsEngine:
     def __init__(self, multiplier=50):
         self.multiplier = multiplier
@@ -105,6 +108,95 @@ class OptionsEngine:
             logger.error(f"Error estimating probability: {e}")
             return 0.5
     
+    def price_options(self, spot, strikes, days_to_expiry, volatility):
+        """
+        Black-Scholes ceny call/put (r = 0), vektorizovaně přes pole strikes
+        """
+        time_to_expiry = np.maximum(np.asarray(days_to_expiry, dtype=float),
+                                    MIN_DAYS_TO_EXPIRY) / 365.0
+        vol_sqrt_t = volatility * np.sqrt(time_to_expiry)
+        d1 = (np.log(spot / strikes) + 0.5 * vol_sqrt_t**2) / vol_sqrt_t
+        d2 = d1 - vol_sqrt_t
+
+        call = spot * norm.cdf(d1) - strikes * norm.cdf(d2)
+        put = strikes * norm.cdf(-d2) - spot * norm.cdf(-d1)
+        return call, put
+
+    def optimize_strategy_grid(self, magnet_data, volatility,
+                               wing_widths=(10, 15, 20, 25, 30, 40, 50),
+                               short_offsets=(0, 5, 10, 15, 20),
+                               expiries=(1, 2, 3, 5, 7), spot=None):
+        """
+        Vyhodnotí mřížku iron butterfly/condor kolem magnetu najednou
+        a vrátí Pareto frontu pravděpodobnosti zisku vs risk/reward
+        """
+        try:
+            magnet_level = magnet_data["level"]
+            spot = magnet_level if spot is None else spot
+
+            width, offset, days = np.meshgrid(
+                np.asarray(wing_widths, dtype=float),
+                np.asarray(short_offsets, dtype=float),
+                np.asarray(expiries, dtype=float),
+                indexing="ij"
+            )
+            width, offset, days = width.ravel(), offset.ravel(), days.ravel()
+
+            short_call = magnet_level + offset
+            short_put = magnet_level - offset
+            long_call = short_call + width
+            long_put = short_put - width
+
+            # Všechny čtyři nohy v jednom volání
+            strikes = np.concatenate([short_call, short_put, long_call, long_put])
+            calls, puts = self.price_options(spot, strikes, np.tile(days, 4), volatility)
+            calls, puts = calls.reshape(4, -1), puts.reshape(4, -1)
+
+            net_premium = calls[0] + puts[1] - calls[2] - puts[3]
+            max_profit = net_premium * self.multiplier
+            max_risk = (width - net_premium) * self.multiplier
+
+            upper_be = short_call + net_premium
+            lower_be = short_put - net_premium
+
+            # P(lower_be < S_T < upper_be) pod lognormálním modelem
+            vol_sqrt_t = volatility * np.sqrt(np.maximum(days, MIN_DAYS_TO_EXPIRY) / 365.0)
+            d2_upper = (np.log(spot / upper_be) - 0.5 * vol_sqrt_t**2) / vol_sqrt_t
+            d2_lower = (np.log(spot / lower_be) - 0.5 * vol_sqrt_t**2) / vol_sqrt_t
+            pop = norm.cdf(d2_lower) - norm.cdf(d2_upper)
+
+            risk_reward = np.where(max_risk > 0, max_profit / np.maximum(max_risk, 1e-9), 0)
+            valid = (net_premium > 0) & (max_risk > 0)
+
+            # Pareto fronta: seřaď podle POP, drž rostoucí risk/reward
+            idx = np.flatnonzero(valid)
+            idx = idx[np.lexsort((-risk_reward[idx], -pop[idx]))]
+            best_before = np.maximum.accumulate(
+                np.concatenate([[-np.inf], risk_reward[idx][:-1]])
+            )
+            frontier = idx[risk_reward[idx] > best_before]
+
+            return [{
+                "strategy": "Iron Butterfly" if offset[i] == 0 else "Iron Condor",
+                "sell_call": short_call[i],
+                "sell_put": short_put[i],
+                "buy_call": long_call[i],
+                "buy_put": long_put[i],
+                "width": width[i],
+                "expiry_days": int(days[i]),
+                "net_premium": net_premium[i],
+                "max_profit": max_profit[i],
+                "max_risk": max_risk[i],
+                "upper_be": upper_be[i],
+                "lower_be": lower_be[i],
+                "probability_of_profit": pop[i],
+                "risk_reward": risk_reward[i]
+            } for i in frontier]
+
+        except Exception as e:
+            logger.error(f"Error optimizing strategy grid: {e}")
+            return []
+
     def get_strategy_recommendation(self, magnet_data, volatility, 
                                    price_call=8.0, price_put=8.0):
         """
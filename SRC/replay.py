@@ -0,0 +1,195 @@
+# src/replay.py
+import numpy as np
+import pandas as pd
+import time
+import logging
+from src.magnet_detector import MagnetDetector
+from src.resampler import BarResampler, TIMEFRAMES
+
+logger = logging.getLogger(__name__)
+
+def synthetic_bars(n_bars, start_price=6700.0, interval_seconds=1, start=None,
+                   tick=0.25, seed=None):
+    """Syntetické OHLCV bary (náhodná procházka zaokrouhlená na tick)"""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp.now().floor("s") if start is None else pd.Timestamp(start)
+
+    steps = rng.normal(0, 0.5, size=n_bars)
+    close = np.round((start_price + np.cumsum(steps)) / tick) * tick
+    open_ = np.concatenate([[start_price], close[:-1]])
+    spread = np.round(np.abs(rng.normal(0, 0.5, size=n_bars)) / tick) * tick
+
+    return pd.DataFrame({
+        "Datetime": start + pd.to_timedelta(np.arange(n_bars) * interval_seconds, unit="s"),
+        "Open": open_,
+        "High": np.maximum(open_, close) + spread,
+        "Low": np.minimum(open_, close) - spread,
+        "Close": close,
+        "Volume": rng.integers(1, 500, size=n_bars)
+    })
+
+def record_bars(data_fetcher, timeframe="1m", days=1):
+    """Nahrané bary z fetcheru pro replay"""
+    bars = data_fetcher.get_bars(timeframe, days)
+    return {data_fetcher.es_symbol: bars} if bars is not None else {}
+
+class BarReplay:
+    """
+    Přehrává bary přes řetězec fetcher → MagnetDetector → OptionsEngine → RiskManager
+    zrychleně (1× až 1000×) a měří propustnost a latenci bar → signál.
+    Každý symbol má vlastní BarResampler (datová vrstva fetcheru) a vlastní
+    MagnetDetector, aby se historie magnetů mezi symboly nemíchala.
+    timeframe=None pracuje přímo s příchozími bary (např. 1s), jinak vstup
+    musí být 1m bary a okno se bere z odvozeného timeframu resampleru.
+    """
+    def __init__(self, magnet_detector, options_engine, risk_manager,
+                 window=20, volatility=0.15, timeframe=None, buffer_bars=1000):
+        self.magnet_detector = magnet_detector  # šablona pro detektory symbolů
+        self.options_engine = options_engine
+        self.risk_manager = risk_manager
+        self.window = window
+        self.volatility = volatility
+        self.timeframe = timeframe
+        self.buffer_bars = buffer_bars
+
+    def _detector_for_symbol(self):
+        """Nový detektor se stejným nastavením jako šablona"""
+        template = self.magnet_detector
+        return MagnetDetector(
+            template.multipliers, template.tolerance,
+            history_size=template.magnet_memory.capacity,
+            history_max_age=template.magnet_memory.max_age
+        )
+
+    def _schedule(self, frames):
+        """Sloučí bary všech symbolů do jednoho pořadí příchodu"""
+        times = np.concatenate([f.index.values.astype("datetime64[ns]").astype(np.int64)
+                                for f in frames])
+        symbols = np.concatenate([np.full(len(f), s) for s, f in enumerate(frames)])
+        rows = np.concatenate([np.arange(len(f)) for f in frames])
+
+        order = np.argsort(times, kind="stable")
+        return times[order], symbols[order], rows[order]
+
+    def _check_interval(self, frames):
+        """Resampler očekává 1m vstup - ověř interval barů pro timeframe"""
+        if self.timeframe is None:
+            return
+        if self.timeframe not in TIMEFRAMES:
+            raise ValueError(f"Neznámý timeframe {self.timeframe}")
+
+        for frame in frames:
+            if len(frame) < 2:
+                continue
+            interval = np.median(np.diff(frame.index.asi8)) / 1e9
+            if interval != 60:
+                raise ValueError(
+                    f"timeframe={self.timeframe} vyžaduje 1m bary, vstup má "
+                    f"interval {interval:g} s (pro surové bary použij timeframe=None)"
+                )
+
+    def process_bar(self, detector, window):
+        """Jeden průchod řetězcem, vrací doporučení nebo None"""
+        magnet_data = detector.detect_active_magnet(window)
+        if not magnet_data or not magnet_data['is_active']:
+            return None
+
+        rec = self.options_engine.get_strategy_recommendation(
+            magnet_data, self.volatility
+        )
+        if rec['action'].startswith("SELL"):
+            rec['size'] = self.risk_manager.get_position_size(rec['strategy'])
+        return rec
+
+    def run(self, bars_by_symbol, speed=1.0, max_bars=None):
+        """
+        bars_by_symbol = {symbol: DataFrame s Datetime a OHLCV}
+        speed = násobek reálného času (float('inf') = bez čekání)
+        """
+        if speed <= 0:
+            raise ValueError("speed musí být kladné")
+
+        frames = [f.sort_values("Datetime").set_index("Datetime")
+                  for f in bars_by_symbol.values() if f is not None and not f.empty]
+        times = np.array([], dtype=np.int64)
+        if frames:
+            times, symbols, rows = self._schedule(frames)
+            if max_bars is not None:
+                times, symbols, rows = times[:max_bars], symbols[:max_bars], rows[:max_bars]
+
+        if len(times) == 0:
+            logger.warning("Replay: žádné bary k přehrání")
+            return self._report(0, len(frames), 0.0, np.array([]), np.array([]), speed)
+
+        self._check_interval(frames)
+        timeframe = self.timeframe or "1m"  # "1m" = základní (příchozí) bary
+
+        resamplers = [BarResampler(max_bars=self.buffer_bars) for _ in frames]
+        detectors = [self._detector_for_symbol() for _ in frames]
+
+        latencies = np.empty(len(times))
+        signal_latencies = []
+        reached_window = np.zeros(len(frames), dtype=bool)
+        first_bar = times[0]
+        start = time.perf_counter()
+
+        for n, (bar_time, s, i) in enumerate(zip(times, symbols, rows)):
+            # Plánovaný čas příchodu baru
+            if np.isinf(speed):
+                arrival = time.perf_counter()
+            else:
+                arrival = start + (bar_time - first_bar) / 1e9 / speed
+                delay = arrival - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            # Fetcher: příchozí bar do resampleru, okno z jeho výstupu
+            resamplers[s].append(frames[s].iloc[i:i + 1])
+            bars = resamplers[s].get(timeframe)
+            signal = None
+            if bars is not None and len(bars) >= self.window:
+                reached_window[s] = True
+                window = bars.tail(self.window).reset_index()
+                signal = self.process_bar(detectors[s], window)
+
+            latencies[n] = time.perf_counter() - arrival
+            if signal is not None:
+                signal_latencies.append(latencies[n])
+
+        elapsed = time.perf_counter() - start
+
+        if not reached_window.all():
+            logger.warning(
+                f"Replay: {int((~reached_window).sum())} z {len(frames)} symbolů nedosáhlo "
+                f"okna {self.window} barů timeframu {timeframe} - žádné signály"
+            )
+
+        return self._report(len(times), len(frames), elapsed, latencies,
+                            np.array(signal_latencies), speed)
+
+    def _report(self, n_bars, n_symbols, elapsed, latencies, signal_latencies, speed):
+        """
+        Souhrn propustnosti a latence replaye. processing_* = zpracování
+        každého baru, signal_* = bar → signál jen pro bary se signálem.
+        """
+        def percentile_ms(values, q):
+            return float(np.percentile(values, q) * 1000) if len(values) else 0
+
+        report = {
+            "bars": n_bars,
+            "symbols": n_symbols,
+            "signals": len(signal_latencies),
+            "elapsed": elapsed,
+            "throughput": n_bars / elapsed if elapsed > 0 else 0,
+            "processing_latency_p50_ms": percentile_ms(latencies, 50),
+            "processing_latency_p99_ms": percentile_ms(latencies, 99),
+            "signal_latency_p50_ms": percentile_ms(signal_latencies, 50),
+            "signal_latency_p99_ms": percentile_ms(signal_latencies, 99),
+            "speed": speed
+        }
+
+        logger.info(f"Replay: {report['bars']} barů, {report['throughput']:,.0f} barů/s, "
+                    f"{report['signals']} signálů, bar → signál p50 "
+                    f"{report['signal_latency_p50_ms']:.2f} ms, p99 "
+                    f"{report['signal_latency_p99_ms']:.2f} ms")
+        return report
@@ -0,0 +1,88 @@
+# src/resampler.py
+import pandas as pd
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAMES = {
+    "1m": "1min",
+    "5m": "5min",
+    "15m": "15min",
+    "1h": "1h"
+}
+
+OHLCV_AGG = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum"
+}
+
+class BarResampler:
+    """
+    Drží pouze 1m bary, vyšší timeframy odvozuje a cachuje.
+    Nové 1m bary přepočítají jen poslední (neúplný) bar odvozených timeframů.
+    Instance je sdílená mezi session dashboardu, proto je chráněná zámkem.
+    """
+    def __init__(self, max_bars=None):
+        self.max_bars = max_bars  # limit uložených 1m barů
+        self.bars = None          # 1m OHLCV, index = Datetime
+        self.derived = {}
+        self.lock = threading.Lock()
+
+    def _resample(self, bars, timeframe):
+        return bars.resample(TIMEFRAMES[timeframe]).agg(OHLCV_AGG).dropna(subset=["Close"])
+
+    def append(self, new_bars):
+        """Přidá 1m bary (přepíše překrývající se, např. neuzavřený bar)"""
+        try:
+            new_bars = new_bars[list(OHLCV_AGG)].sort_index()
+            if new_bars.empty:
+                return
+
+            with self.lock:
+                first_new = new_bars.index[0]
+                if self.bars is None:
+                    self.bars = new_bars
+                else:
+                    self.bars = pd.concat([self.bars[self.bars.index < first_new], new_bars])
+
+                trimmed = self.max_bars and len(self.bars) > self.max_bars
+                if trimmed:
+                    self.bars = self.bars.iloc[-self.max_bars:]
+
+                # Inkrementální update cachovaných timeframů
+                for timeframe, cached in self.derived.items():
+                    freq = TIMEFRAMES[timeframe]
+                    cutoff = first_new.floor(freq)
+                    updated = self._resample(self.bars[self.bars.index >= cutoff], timeframe)
+
+                    # Po ořezu obsahuje nejstarší bucket i zahozené 1m bary
+                    keep_from = self.bars.index[0].floor(freq)
+                    head = cached.iloc[:0]
+                    if trimmed and keep_from < cutoff:
+                        keep_from = keep_from + pd.Timedelta(freq)
+                        head = self._resample(
+                            self.bars[self.bars.index < min(keep_from, cutoff)], timeframe
+                        )
+
+                    cached = cached[(cached.index >= keep_from) & (cached.index < cutoff)]
+                    self.derived[timeframe] = pd.concat([head, cached, updated])
+
+        except Exception as e:
+            logger.error(f"Error appending bars: {e}")
+
+    def get(self, timeframe="5m"):
+        """Vrátí OHLCV pro daný timeframe (1m, 5m, 15m, 1h)"""
+        with self.lock:
+            if self.bars is None:
+                return None
+            if timeframe == "1m":
+                return self.bars
+
+            if timeframe not in self.derived:
+                self.derived[timeframe] = self._resample(self.bars, timeframe)
+
+            return self.derived[timeframe]
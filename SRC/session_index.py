@@ -0,0 +1,71 @@
+# src/session_index.py
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Globex session ES začíná v 18:00 předchozího dne
+ETH_ROLL_HOURS = 6
+
+class SessionIndex:
+    """
+    Předpočítané offsety session (start/end) nad seřazenými bary.
+    Iterace přes session jsou pouhé řezy bez kopírování dat.
+    """
+    def __init__(self, datetimes, session_start="09:30", session_end="16:00",
+                 mode="RTH"):
+        self.mode = mode
+        self.mask = self.session_mask(datetimes, session_start, session_end, mode)
+        self.starts, self.ends, self.labels = self._build(datetimes, self.mask, mode)
+        logger.info(f"SessionIndex ({mode}): {len(self.starts)} session")
+
+    @staticmethod
+    def session_mask(datetimes, session_start, session_end, mode="RTH"):
+        """Boolean maska barů patřících do session"""
+        dt = pd.DatetimeIndex(datetimes)
+
+        if mode == "ETH":
+            return np.ones(len(dt), dtype=bool)
+
+        start_h, start_m = map(int, session_start.split(":"))
+        end_h, end_m = map(int, session_end.split(":"))
+        minutes = dt.hour.to_numpy() * 60 + dt.minute.to_numpy()
+
+        return (minutes >= start_h * 60 + start_m) & (minutes < end_h * 60 + end_m)
+
+    @staticmethod
+    def _build(datetimes, mask, mode):
+        """Najde souvislé úseky masky v rámci jednoho obchodního dne"""
+        dt = pd.DatetimeIndex(datetimes)
+        if mode == "ETH":
+            dt = dt + pd.Timedelta(hours=ETH_ROLL_HOURS)
+        days = dt.normalize()
+
+        positions = np.flatnonzero(mask)
+        if len(positions) == 0:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, np.array([], dtype=object)
+
+        day_keys = days.asi8[positions]
+        breaks = (np.diff(positions) != 1) | (np.diff(day_keys) != 0)
+        first = np.concatenate([[0], np.flatnonzero(breaks) + 1])
+        last = np.concatenate([np.flatnonzero(breaks), [len(positions) - 1]])
+
+        starts = positions[first]
+        ends = positions[last] + 1
+        labels = days[starts].date
+
+        return starts, ends, labels
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        """Vrací (label, start, end) pro každou session"""
+        return zip(self.labels, self.starts, self.ends)
+
+    def views(self, *arrays):
+        """(label, start, řezy polí) pro každou session - view, ne kopie"""
+        for label, start, end in self:
+            yield label, start, [array[start:end] for array in arrays]
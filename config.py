@@ -34,6 +34,16 @@ MAGNET_HOLD_TIME = 15  # minut
 VP_RATIO_THRESHOLD = 1.3
 MMI_THRESHOLD = 1.5
 VLS_THRESHOLD = 2.0
+ATR_DAYS = 5           # okno ATR pro MMI
+AVG_VOLUME_DAYS = 20   # okno průměrného objemu pro VLS
+# MMI/VLS vstupní filtr v backtestu (volitelný). Magnety jsou po 50 bodech,
+# takže |MMI| ≈ 50 / denní ATR - při ATR ES nad 33 body práh 1.5 nepropustí
+# téměř nic. Zapínat až po kalibraci MMI_THRESHOLD na aktuální ATR.
+ENTRY_FILTERS_ENABLED = False
+
+# Sdílená cache barů (napříč session dashboardu)
+BAR_CACHE_TTL = 30          # sekund
+BAR_CACHE_MAX_ENTRIES = 32
 
 # API klíče (pro reálná data)
 POLYGON_API_KEY = os.getenv("POLYGON_API_KEY", "")
@@ -1,6 +1,7 @@
 # main.py
 import streamlit as st
 import sys
+import math
 sys.path.append('.')
 from config import *
 from src.data_fetcher import ESDataFetcher
@@ -8,6 +9,8 @@ from src.magnet_detector import MagnetDetector
 from src.options_engine import OptionsEngine
 from src.risk_manager import RiskManager
 from src.backtester import Backtester
+from src.feature_store import FeatureStore
+from src.bar_cache import SharedBarCache
 import logging
 
 # Logging setup
@@ -42,10 +45,15 @@ max_daily_loss_pct = st.sidebar.slider(
     step=0.5
 )
 
+# Sdílená cache barů pro všechny uživatele
+@st.cache_resource
+def get_bar_cache():
+    return SharedBarCache(ttl=BAR_CACHE_TTL, max_entries=BAR_CACHE_MAX_ENTRIES)
+
 # Inicializace komponentů
 @st.cache_resource
 def init_system(balance, daily_loss_pct):
-    data_fetcher = ESDataFetcher()
+    data_fetcher = ESDataFetcher(cache=get_bar_cache())
     magnet_detector = MagnetDetector(
         multipliers=[50, 100],
         tolerance=MAGNET_TOLERANCE
@@ -59,8 +67,26 @@ def init_system(balance, daily_loss_pct):
         max_trade_loss=0.01,
         kelly_fraction=KELLY_FRACTION
     )
+    feature_store = FeatureStore(
+        cache_dir=DATA_DIR,
+        multipliers=MAGNET_MULTIPLIERS,
+        tolerance=MAGNET_TOLERANCE,
+        atr_days=ATR_DAYS,
+        volume_days=AVG_VOLUME_DAYS,
+        mmi_threshold=MMI_THRESHOLD,
+        vls_threshold=VLS_THRESHOLD
+    )
+    # Backtest má vlastní detektor, aby nepřepisoval historii live magnetů
+    backtest_detector = MagnetDetector(
+        multipliers=[50, 100],
+        tolerance=MAGNET_TOLERANCE
+    )
     backtester = Backtester(
-        data_fetcher, magnet_detector, options_engine, risk_manager
+        data_fetcher, backtest_detector, options_engine, risk_manager,
+        feature_store=feature_store,
+        use_entry_filters=ENTRY_FILTERS_ENABLED,
+        session_start=SESSION_START,
+        session_end=SESSION_END
     )
     return data_fetcher, magnet_detector, options_engine, risk_manager, backtester
 
@@ -117,13 +143,22 @@ with tab1:
                     magnet_data = magnet_detector.detect_active_magnet(window)
                     
                     if magnet_data and magnet_data['is_active']:
+                        volatility = data['vix'] / 100
                         rec = options_engine.get_strategy_recommendation(
-                            magnet_data
+                            magnet_data, volatility
                         )
                         
                         st.subheader("🎯 OBCHODNÍ SIGNÁL")
                         st.json(rec)
                         
+                        # Pareto fronta POP vs risk/reward přes mřížku strategií
+                        frontier = options_engine.optimize_strategy_grid(
+                            magnet_data, volatility, spot=data['price']
+                        )
+                        if frontier:
+                            st.subheader("Pareto Fronta Strategií")
+                            st.dataframe(frontier)
+                        
                         # Zobraz Kelly sizing
                         if rec['action'].startswith("SELL"):
                             size = risk_manager.get_position_size(rec['strategy'])
@@ -160,12 +195,32 @@ with tab2:
                     st.metric("Celkový PnL", f"${results['total_pnl']:,.2f}")
                     st.metric("Finální Balance", f"${results['final_balance']:,.2f}")
                     
-                    if results['edge'] > 0.15:
+                    ci = results.get('confidence_intervals') or {}
+                    edge_ci = ci.get('edge')
+                    edge_low = edge_ci['lower'] if edge_ci else results['edge']
+                    
+                    if math.isnan(edge_low):
+                        st.warning("⚠️ EDGE NELZE URČIT - chybí ztrátové obchody")
+                    elif edge_low > 0.15:
                         st.success("✅ EDGE JE KASINO-LEVEL")
                     elif results['edge'] > 0:
                         st.warning("⚠️ MÍRNÁ EDGE")
                     else:
                         st.error("❌ NEGATIVNÍ EDGE")
+                    
+                    if edge_ci and edge_ci['undefined'] > 0:
+                        st.caption(f"Edge nedefinovaná v {edge_ci['undefined']:.1%} resamplů (bez ztrát)")
+                
+                if results.get('confidence_intervals'):
+                    st.subheader("95% Bootstrap Intervaly")
+                    st.table({
+                        name: {
+                            "Dolní": interval['lower'],
+                            "Horní": interval['upper'],
+                            "Nedefinováno": f"{interval['undefined']:.1%}"
+                        }
+                        for name, interval in results['confidence_intervals'].items()
+                    })
             else:
                 st.error("Backtest selhal")
 